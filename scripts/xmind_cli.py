@@ -7,13 +7,25 @@ Usage:
     python xmind_cli.py show <file.xmind>
     python xmind_cli.py add <file.xmind> --parent "Parent" --topic "New Topic" [--note "Note"] [--comment "Comment"]
     python xmind_cli.py markdown <file.xmind> [--style headers|bullets]
+    python xmind_cli.py batch <file.xmind> <ops.json>
 
 Requirements:
     pip install xmind
 """
 
+import os
+import codecs
 import sys
+import json
+import time
+import pickle
+import shutil
+import hashlib
+import zipfile
 import argparse
+import tempfile
+import contextlib
+import xml.etree.ElementTree as ET
 
 try:
     import xmind
@@ -21,152 +33,512 @@ try:
     from xmind.core.topic import TopicElement
     from xmind.core.styles import StylesBookDocument
     from xmind.core.comments import CommentsBookDocument
+    from xmind.core.markerref import MarkerId
 except ImportError:
     print("Error: xmind SDK is not installed.")
     print("Install it with: pip install xmind")
     sys.exit(1)
 
+# orjson is optional; it only speeds up parsing of batch operation files
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+# Parsed sheets of read-only commands are cached here (see load_sheets).
+# Bump CACHE_VERSION whenever the pickled layout changes.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "xmind-cli")
+CACHE_VERSION = 3
+# Oldest entries beyond this many are removed whenever the cache is written
+CACHE_MAX_ENTRIES = 64
+
+# XML namespaces of content.xml and comments.xml, in ElementTree form
+_C = "{urn:xmind:xmap:xmlns:content:2.0}"
+_COMMENTS = "{urn:xmind:xmap:xmlns:comments:2.0}"
+
+# Precomputed indents and Markdown header prefixes ("# ", "## ", ...)
+_INDENT = tuple("  " * i for i in range(64))
+_HEADER = tuple("#" * i + " " for i in range(7))
+
+# Marker IDs the SDK knows about (MarkerId.starRed = "star-red", ...)
+KNOWN_MARKERS = frozenset(
+    value for name, value in vars(MarkerId).items()
+    if not name.startswith("_") and isinstance(value, str)
+)
+
+# Required keys of each batch operation, and every key that must be a string
+BATCH_OPS = {"add": ("parent", "topic"), "edit": ("target",)}
+BATCH_FIELDS = ("op", "parent", "topic", "target", "title", "note", "comment", "marker", "label")
+
+# Archive members regenerated from the in-memory workbook on every save
+XML_MEMBERS = ("content.xml", "styles.xml", "comments.xml")
+
+# 1980-01-01 00:00 UTC, the earliest date a ZIP entry can carry
+ZIP_EPOCH = 315532800
+
+# Regenerated members smaller than this are stored uncompressed
+STORE_BELOW = 64 * 1024
+
+
+def _cache_path(path):
+    """Return the sheet cache file for path, keyed on its mtime and size.
+
+    Names are "<path hash>-<state hash>.pkl", so entries left behind for
+    older versions of the same file can be found and removed.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    path_key = hashlib.sha1(path.encode()).hexdigest()
+    state_key = f"{CACHE_VERSION}:{st.st_mtime_ns}:{st.st_size}"
+    state_key = hashlib.sha1(state_key.encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{path_key}-{state_key}.pkl")
+
+
+def _prune_cache(cache_path):
+    """Drop stale entries for the same file and cap the cache size."""
+    prefix = os.path.basename(cache_path).split("-", 1)[0] + "-"
+    entries = []
+    with os.scandir(CACHE_DIR) as it:
+        for entry in it:
+            if entry.path == cache_path or not entry.name.endswith(".pkl"):
+                continue
+            if entry.name.startswith(prefix):
+                os.remove(entry.path)
+            else:
+                entries.append((entry.stat().st_mtime, entry.path))
+    # Leave room for the entry just written
+    entries.sort(reverse=True)
+    for _, stale_path in entries[CACHE_MAX_ENTRIES - 1:]:
+        os.remove(stale_path)
+
+
+def _save_time():
+    """Return the ZipInfo date_time shared by every member written in a save.
+
+    Honours SOURCE_DATE_EPOCH so entry dates can be pinned. The archive
+    still varies between saves, as the SDK writes timestamps into the XML.
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch and epoch.isdigit():
+        # ZIP cannot represent dates before 1980; clamp like other zip writers
+        return time.gmtime(max(int(epoch), ZIP_EPOCH))[:6]
+    return time.localtime()[:6]
+
+
+def _new_member(name, compression, date_time):
+    """Return a ZipInfo for a regenerated member.
+
+    zf.open(name, "w") with a plain name would date the entry 1980-01-01.
+    """
+    zinfo = zipfile.ZipInfo(name, date_time)
+    zinfo.compress_type = compression
+    # Python 3.13 renamed the private _compresslevel to compress_level
+    if hasattr(zinfo, "compress_level"):
+        zinfo.compress_level = 1
+    else:
+        zinfo._compresslevel = 1
+    return zinfo
+
+
+def _serialize(doc):
+    """Write an SDK document's XML to a spooled temp file and return it.
+
+    Only documents of STORE_BELOW bytes or more spill to disk, so the
+    caller can learn the encoded size without holding large XML in memory.
+    """
+    data = tempfile.SpooledTemporaryFile(max_size=STORE_BELOW)
+    doc.output(codecs.getwriter("utf-8")(data))
+    return data
+
+
+def save_workbook(workbook, path=None):
+    """Save workbook to path (defaults to the workbook's own path).
+
+    Unlike xmind.save(), which extracts every attachment into a temp
+    directory before re-zipping, other archive members are streamed
+    straight from the original file into the new one.
+    """
+    original = workbook.get_path()
+    path = os.path.abspath(path or original)
+    if os.path.splitext(path)[1] != ".xmind":
+        raise Exception("XMind filename require a '.xmind' extension")
+    # Write through symlinks: replace the file they point to, not the link
+    real_path = os.path.realpath(path)
+
+    docs = {
+        "content.xml": workbook,
+        "styles.xml": workbook.stylesbook,
+        "comments.xml": workbook.commentsbook,
+    }
+
+    old_cache = _cache_path(path) if os.path.exists(path) else None
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(real_path))
+    os.close(fd)
+    has_original = bool(original) and os.path.isfile(original)
+    try:
+        with (zipfile.ZipFile(original, "r") if has_original else contextlib.nullcontext()) as src_zf:
+            with zipfile.ZipFile(tmp_path, "w") as zf:
+                date_time = _save_time()
+                for name in XML_MEMBERS:
+                    # Small members are stored, since deflating them costs
+                    # more time than it saves space; larger ones use level 1,
+                    # which is several times faster than the default level
+                    # and compresses XML nearly as well.
+                    with _serialize(docs[name]) as data:
+                        size = data.tell()
+                        data.seek(0)
+                        compression = zipfile.ZIP_STORED if size < STORE_BELOW else zipfile.ZIP_DEFLATED
+                        zinfo = _new_member(name, compression, date_time)
+                        zinfo.file_size = size
+                        with zf.open(zinfo, "w") as dst:
+                            shutil.copyfileobj(data, dst, 1 << 20)
+
+                for info in src_zf.infolist() if src_zf else ():
+                    if info.filename in XML_MEMBERS or info.is_dir():
+                        continue
+                    with src_zf.open(info) as src, zf.open(info, "w") as dst:
+                        shutil.copyfileobj(src, dst, 1 << 20)
+        # mkstemp creates the file as 0600; keep the target's mode, or give
+        # a new file the usual umask-based one
+        if os.path.exists(real_path):
+            shutil.copymode(real_path, tmp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        # Same directory, so this is an atomic rename rather than a copy
+        os.replace(tmp_path, real_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if old_cache and os.path.exists(old_cache):
+        os.remove(old_cache)
+
+
+def load_sheets(path):
+    """Load [(sheet title, root TopicNode)] for path.
+
+    The extracted trees are pickled under CACHE_DIR, so repeated read-only
+    commands on an unchanged file skip parsing entirely.
+    """
+    cache_path = _cache_path(path)
+    try:
+        with open(cache_path, "rb") as f:
+            return _unflatten_sheets(pickle.load(f))
+    except FileNotFoundError:
+        pass
+    except Exception:
+        # Corrupt or unreadable entry; drop it and parse again
+        with contextlib.suppress(OSError):
+            os.remove(cache_path)
+
+    sheets = read_sheets(path)
+
+    # The cache is best effort: any failure to write it just means no caching
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(_flatten_sheets(sheets), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        _prune_cache(cache_path)
+    except Exception:
+        pass
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+    return sheets
+
 
 def get_root_topic(workbook):
     """Get the root topic from workbook."""
-    # Find first sheet with a valid root topic
+    # Primary sheet first; it is the only sheet in most files
+    sheet = workbook.getPrimarySheet()
+    primary_root = sheet.getRootTopic() if sheet else None
+    if primary_root and primary_root.getTitle():
+        return primary_root
+    # Otherwise find first sheet with a valid root topic
     for sheet in workbook.getSheets():
         root = sheet.getRootTopic()
         if root and root.getTitle():
             return root
     # Fallback to primary sheet
-    sheet = workbook.getPrimarySheet()
-    if sheet:
-        return sheet.getRootTopic()
-    return None
+    return primary_root
+
+
+def build_index(root):
+    """Index every topic under root by title.
+
+    Returns a dict mapping title -> (topic, parent). When several topics
+    share a title, the first one in document order wins.
+    """
+    index = {}
+    stack = [(root, None)]
+    while stack:
+        topic, parent = stack.pop()
+        index.setdefault(topic.getTitle(), (topic, parent))
+        for subtopic in reversed(topic.getSubTopics() or []):
+            stack.append((subtopic, topic))
+    return index
+
+
+def find_topic(root, title):
+    """Return (topic, parent) for the first topic titled title, or (None, None).
+
+    For a single lookup this stops at the match instead of indexing the
+    whole tree the way build_index() does.
+    """
+    stack = [(root, None)]
+    while stack:
+        topic, parent = stack.pop()
+        if topic.getTitle() == title:
+            return topic, parent
+        for subtopic in reversed(topic.getSubTopics() or []):
+            stack.append((subtopic, topic))
+    return None, None
+
+
+def _text(elem):
+    """Return elem's own text, joined the way the SDK's getTextContent() does."""
+    if elem is None:
+        return None
+    parts = [part for part in [elem.text] + [child.tail for child in elem] if part]
+    return "\n".join(parts) if parts else None
+
+
+class TopicNode:
+    """Displayed fields of one topic, as used by show and markdown.
+
+    Slotted rather than a dict: large maps hold one of these per topic,
+    both in memory and in the pickled sheet cache.
+    """
+    __slots__ = ("title", "notes", "comments", "markers", "labels", "children")
+
+
+def topic_to_node(root, comments_by_id):
+    """Extract a content.xml topic tree into TopicNode objects.
+
+    Nodes hold only strings and lists, so the result can be cached with
+    pickle and rendered without parsing the file again.
+    """
+    result = TopicNode()
+    stack = [(root, result)]
+    while stack:
+        elem, node = stack.pop()
+        node.title = _text(elem.find(_C + "title"))
+        node.notes = _text(elem.find(f"{_C}notes/{_C}plain"))
+        comment = comments_by_id.get(elem.get("id"))
+        node.comments = [comment] if comment else []
+        node.markers = [ref.get("marker-id") for ref in elem.iterfind(f"{_C}marker-refs/{_C}marker-ref")]
+        # One label per topic, as in the SDK
+        label = _text(elem.find(f"{_C}labels/{_C}label"))
+        node.labels = [label] if label else []
+
+        attached = elem.find(f"{_C}children/{_C}topics[@type='attached']")
+        subtopics = attached.findall(_C + "topic") if attached is not None else []
+        node.children = children = [TopicNode() for _ in subtopics]
+        stack.extend(zip(subtopics, children))
+
+    return result
+
+
+def _flatten_sheets(sheets):
+    """Turn [(title, root TopicNode)] into preorder (depth, fields...) rows.
+
+    pickle recurses once per level of a nested object tree, so deep maps
+    would exceed the recursion limit; flat rows keep the pickled depth
+    constant.
+    """
+    flat = []
+    for title, root in sheets:
+        rows = []
+        stack = [(root, 0)] if root else []
+        while stack:
+            node, depth = stack.pop()
+            rows.append((depth, node.title, node.notes, node.comments, node.markers, node.labels))
+            for child in reversed(node.children):
+                stack.append((child, depth + 1))
+        flat.append((title, rows))
+    return flat
+
+
+def _unflatten_sheets(flat):
+    """Rebuild [(title, root TopicNode)] from _flatten_sheets() output."""
+    sheets = []
+    for title, rows in flat:
+        root = None
+        parents = []
+        for depth, *fields in rows:
+            node = TopicNode()
+            node.title, node.notes, node.comments, node.markers, node.labels = fields
+            node.children = []
+            del parents[depth:]
+            if parents:
+                parents[-1].children.append(node)
+            else:
+                root = node
+            parents.append(node)
+        sheets.append((title, root))
+    return sheets
+
+
+def read_sheets(path):
+    """Parse [(sheet title, root TopicNode)] straight from the archive.
+
+    Read-only commands need only a few fields per topic, so content.xml and
+    comments.xml are parsed with ElementTree rather than loading the SDK's
+    DOM-backed workbook.
+    """
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+        if "content.xml" not in names:
+            if "content.json" in names:
+                raise Exception("XMind Zen files (content.json) are not supported")
+            raise Exception(f"content.xml not found in {path}")
+        content = ET.fromstring(zf.read("content.xml"))
+        comments = ET.fromstring(zf.read("comments.xml")) if "comments.xml" in names else None
+
+    # Several comments on one topic are joined with newlines, as in the SDK
+    comments_by_id = {}
+    if comments is not None:
+        for comment in comments.iter(_COMMENTS + "comment"):
+            object_id = comment.get("object-id")
+            text = _text(comment.find(_COMMENTS + "content")) or ""
+            if object_id in comments_by_id:
+                comments_by_id[object_id] += "\n" + text
+            else:
+                comments_by_id[object_id] = text
+
+    sheets = []
+    for sheet in content.findall(_C + "sheet"):
+        root = sheet.find(_C + "topic")
+        sheets.append((
+            _text(sheet.find(_C + "title")),
+            topic_to_node(root, comments_by_id) if root is not None else None,
+        ))
+    return sheets
+
+
+def _indent(depth):
+    """Return the two-space indent for depth."""
+    return _INDENT[depth] if depth < len(_INDENT) else "  " * depth
+
+
+def topic_to_tree(root):
+    """Yield the tree representation of a TopicNode, one line at a time."""
+    stack = [(root, 0)]
+    while stack:
+        node, level = stack.pop()
+        indent = _indent(level)
+        child_indent = _indent(level + 1)
+        prefix = "- " if level > 0 else ""
+        yield f"{indent}{prefix}{node.title or 'Untitled'}"
+
+        # Show notes if exists
+        if node.notes:
+            yield f"{child_indent}> {node.notes}"
+
+        # Show comments if exists
+        for comment in node.comments:
+            yield f"{child_indent}// {comment}"
+
+        # Show markers
+        if node.markers:
+            yield f"{child_indent}[markers: {', '.join(node.markers)}]"
+
+        # Show labels
+        if node.labels:
+            yield f"{child_indent}[labels: {', '.join(node.labels)}]"
+
+        # Push children in reverse so they are emitted in document order
+        for child in reversed(node.children):
+            stack.append((child, level + 1))
+
+
+def _fmt_headers(title, level):
+    """Emit a header for levels 1-6, then bullets below that."""
+    if level <= 6:
+        yield f"{_HEADER[level]}{title}"
+        yield ""
+    else:
+        yield f"{_indent(level - 7)}- {title}"
 
 
-def find_topic_by_title(topic, title):
-    """Find a topic by title recursively."""
-    if topic.getTitle() == title:
-        return topic
-    for subtopic in topic.getSubTopics() or []:
-        found = find_topic_by_title(subtopic, title)
-        if found:
-            return found
-    return None
+def _fmt_bullets(title, level):
+    """Emit a nested bullet."""
+    yield f"{_indent(level - 1)}- {title}"
 
 
-def topic_to_tree(topic, level=0):
-    """Convert topic to tree representation."""
-    indent = "  " * level
-    prefix = "- " if level > 0 else ""
-    lines = [f"{indent}{prefix}{topic.getTitle() or 'Untitled'}"]
+_MARKDOWN_FORMATTERS = {"headers": _fmt_headers, "bullets": _fmt_bullets}
 
-    # Show notes if exists
-    notes = topic.getNotes()
-    if notes:
-        note_indent = "  " * (level + 1)
-        # Notes may be a string or an object
-        if isinstance(notes, str):
-            lines.append(f"{note_indent}> {notes}")
-        else:
-            try:
-                plain_notes = notes.getContent() if hasattr(notes, 'getContent') else None
-                if not plain_notes:
-                    plain = notes.getFirstChildNodeByTagName('plain') if hasattr(notes, 'getFirstChildNodeByTagName') else None
-                    if plain:
-                        plain_notes = plain.getTextContent()
-                if plain_notes:
-                    lines.append(f"{note_indent}> {plain_notes}")
-            except:
-                pass
-
-    # Show comments if exists
-    comments = topic.getComments()
-    if comments:
-        comment_indent = "  " * (level + 1)
-        # Comments may be a string or a list
-        if isinstance(comments, str):
-            lines.append(f"{comment_indent}// {comments}")
-        else:
-            for comment in comments:
-                try:
-                    content = comment.getContent() if hasattr(comment, 'getContent') else str(comment)
-                    lines.append(f"{comment_indent}// {content}")
-                except:
-                    pass
-
-    # Show markers
-    markers = topic.getMarkers()
-    if markers:
-        marker_indent = "  " * (level + 1)
-        marker_names = []
-        for m in markers:
-            try:
-                marker_names.append(m.getMarkerId() if hasattr(m, 'getMarkerId') else str(m))
-            except:
-                pass
-        if marker_names:
-            lines.append(f"{marker_indent}[markers: {', '.join(marker_names)}]")
-
-    # Show labels
-    labels = topic.getLabels()
-    if labels:
-        label_indent = "  " * (level + 1)
-        lines.append(f"{label_indent}[labels: {', '.join(labels)}]")
-
-    for subtopic in topic.getSubTopics() or []:
-        lines.append(topic_to_tree(subtopic, level + 1))
-
-    return "\n".join(lines)
-
-
-def topic_to_markdown(topic, level=1, style="headers"):
-    """Convert topic to Markdown format."""
-    lines = []
-    title = topic.getTitle() or "Untitled"
-
-    if style == "headers" and level <= 6:
-        lines.append(f"{'#' * level} {title}")
-        lines.append("")
-    else:
-        indent = "  " * (level - 7 if style == "headers" else level - 1)
-        lines.append(f"{indent}- {title}")
-
-    # Add notes if exists
-    notes = topic.getNotes()
-    if notes:
-        if isinstance(notes, str):
-            lines.append(notes)
-            lines.append("")
-        else:
-            try:
-                plain_notes = notes.getContent() if hasattr(notes, 'getContent') else None
-                if not plain_notes:
-                    plain = notes.getFirstChildNodeByTagName('plain') if hasattr(notes, 'getFirstChildNodeByTagName') else None
-                    if plain:
-                        plain_notes = plain.getTextContent()
-                if plain_notes:
-                    lines.append(plain_notes)
-                    lines.append("")
-            except:
-                pass
-
-    # Add comments if exists
-    comments = topic.getComments()
-    if comments:
-        if isinstance(comments, str):
-            lines.append(f"> **Comment:** {comments}")
-            lines.append("")
-        else:
-            for comment in comments:
-                try:
-                    content = comment.getContent() if hasattr(comment, 'getContent') else str(comment)
-                    lines.append(f"> **Comment:** {content}")
-                    lines.append("")
-                except:
-                    pass
 
-    for subtopic in topic.getSubTopics() or []:
-        lines.append(topic_to_markdown(subtopic, level + 1, style))
+def topic_to_markdown(root, level=1, style="headers"):
+    """Yield the Markdown rendering of a TopicNode, one line at a time."""
+    fmt = _MARKDOWN_FORMATTERS.get(style, _fmt_bullets)
+    stack = [(root, level)]
+    while stack:
+        node, level = stack.pop()
+        yield from fmt(node.title or "Untitled", level)
+
+        # Add notes if exists
+        if node.notes:
+            yield node.notes
+            yield ""
+
+        # Add comments if exists
+        for comment in node.comments:
+            yield f"> **Comment:** {comment}"
+            yield ""
+
+        # Push children in reverse so they are emitted in document order
+        for child in reversed(node.children):
+            stack.append((child, level + 1))
 
-    return "\n".join(lines)
+
+def set_topic_fields(topic, note=None, comment=None, marker=None, label=None):
+    """Apply the optional note/comment/marker/label fields to a topic."""
+    # Set note if specified
+    if note:
+        topic.setPlainNotes(note)
+
+    # Add comment if specified
+    if comment:
+        topic.addComment(comment)
+
+    # Add marker if specified
+    if marker:
+        topic.addMarker(marker)
+
+    # Add label if specified
+    if label:
+        topic.addLabel(label)
+
+
+def check_args(file, marker=None, label=None):
+    """Return an error message for obviously bad arguments, or None.
+
+    Only cheap checks, so that add/edit/batch can fail before xmind.load().
+    """
+    if file is not None and not os.path.isfile(file):
+        return f"File '{file}' not found"
+    if marker is not None and marker not in KNOWN_MARKERS:
+        return f"Unknown marker '{marker}'"
+    if label is not None and not label.strip():
+        return "Label must not be empty"
+    return None
+
+
+def load_ops(path):
+    """Load batch operations from a JSON array or NDJSON file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data.lstrip().startswith(b"["):
+        return _loads(data)
+    return [_loads(line) for line in data.splitlines() if line.strip()]
 
 
 def cmd_create(args):
@@ -183,38 +555,46 @@ def cmd_create(args):
     root = sheet.getRootTopic()
     root.setTitle(args.root)
 
-    xmind.save(workbook)
+    save_workbook(workbook)
     print(f"Created: {args.file}")
     print(f"Root topic: {args.root}")
 
 
 def cmd_show(args):
     """Show XMind structure."""
-    workbook = xmind.load(args.file)
-
-    for sheet in workbook.getSheets():
-        print(f"=== {sheet.getTitle() or 'Sheet'} ===")
-        root = sheet.getRootTopic()
+    # Stream lines to stdout rather than building the whole document
+    write = sys.stdout.write
+    for title, root in load_sheets(args.file):
+        write(f"=== {title or 'Sheet'} ===\n")
         if root:
-            print(topic_to_tree(root))
-        print()
+            for line in topic_to_tree(root):
+                write(line)
+                write("\n")
+        write("\n")
 
 
 def cmd_markdown(args):
     """Convert XMind to Markdown."""
-    workbook = xmind.load(args.file)
-    sheets = workbook.getSheets()
+    sheets = load_sheets(args.file)
 
-    for sheet in sheets:
+    # Stream lines to stdout rather than building the whole document
+    write = sys.stdout.write
+    for title, root in sheets:
         if len(sheets) > 1:
-            print(f"# {sheet.getTitle() or 'Sheet'}\n")
-        root = sheet.getRootTopic()
+            write(f"# {title or 'Sheet'}\n\n")
         if root:
-            print(topic_to_markdown(root, 1, args.style))
+            for line in topic_to_markdown(root, 1, args.style):
+                write(line)
+                write("\n")
 
 
 def cmd_add(args):
     """Add a topic to XMind file."""
+    error = check_args(args.file, args.marker, args.label)
+    if error:
+        print(f"Error: {error}")
+        sys.exit(1)
+
     workbook = xmind.load(args.file)
     root = get_root_topic(workbook)
 
@@ -223,10 +603,7 @@ def cmd_add(args):
         sys.exit(1)
 
     # Find parent topic
-    if root.getTitle() == args.parent:
-        parent = root
-    else:
-        parent = find_topic_by_title(root, args.parent)
+    parent, _ = find_topic(root, args.parent)
 
     if not parent:
         print(f"Error: Parent topic '{args.parent}' not found")
@@ -235,25 +612,10 @@ def cmd_add(args):
     # Create new topic
     new_topic = workbook.createTopic()
     new_topic.setTitle(args.topic)
-
-    # Add note if specified
-    if args.note:
-        new_topic.setPlainNotes(args.note)
-
-    # Add comment if specified
-    if args.comment:
-        new_topic.addComment(args.comment)
-
-    # Add marker if specified
-    if args.marker:
-        new_topic.addMarker(args.marker)
-
-    # Add label if specified
-    if args.label:
-        new_topic.addLabel(args.label)
+    set_topic_fields(new_topic, args.note, args.comment, args.marker, args.label)
 
     parent.addSubTopic(new_topic)
-    xmind.save(workbook, args.file)
+    save_workbook(workbook, args.file)
 
     print(f"Added '{args.topic}' under '{args.parent}'")
     if args.note:
@@ -268,6 +630,11 @@ def cmd_add(args):
 
 def cmd_edit(args):
     """Edit a topic in XMind file."""
+    error = check_args(args.file, args.marker, args.label)
+    if error:
+        print(f"Error: {error}")
+        sys.exit(1)
+
     workbook = xmind.load(args.file)
     root = get_root_topic(workbook)
 
@@ -276,38 +643,21 @@ def cmd_edit(args):
         sys.exit(1)
 
     # Find target topic
-    if root.getTitle() == args.target:
-        topic = root
-    else:
-        topic = find_topic_by_title(root, args.target)
+    topic, _ = find_topic(root, args.target)
 
     if not topic:
         print(f"Error: Topic '{args.target}' not found")
         sys.exit(1)
 
-    old_title = topic.getTitle()
+    old_title = args.target
 
     # Update title if specified
     if args.title:
         topic.setTitle(args.title)
 
-    # Update note if specified
-    if args.note:
-        topic.setPlainNotes(args.note)
-
-    # Add comment if specified
-    if args.comment:
-        topic.addComment(args.comment)
+    set_topic_fields(topic, args.note, args.comment, args.marker, args.label)
 
-    # Add marker if specified
-    if args.marker:
-        topic.addMarker(args.marker)
-
-    # Add label if specified
-    if args.label:
-        topic.addLabel(args.label)
-
-    xmind.save(workbook, args.file)
+    save_workbook(workbook, args.file)
 
     if args.title:
         print(f"Renamed '{old_title}' to '{args.title}'")
@@ -321,6 +671,109 @@ def cmd_edit(args):
         print(f"Added label: {args.label}")
 
 
+def cmd_batch(args):
+    """Apply a list of add/edit operations with a single load and save."""
+    ops = load_ops(args.ops)
+
+    # Validate every operation before loading the workbook
+    error = check_args(args.file)
+    for n, op in enumerate(ops, 1):
+        if error:
+            break
+        if not isinstance(op, dict):
+            error = f"op {n}: Expected an object, got {type(op).__name__}"
+            break
+        bad = [key for key in BATCH_FIELDS if op.get(key) is not None and not isinstance(op[key], str)]
+        if bad:
+            error = f"op {n}: '{bad[0]}' must be a string"
+            break
+        kind = op.get("op")
+        if kind not in BATCH_OPS:
+            error = f"op {n}: Unknown operation '{kind}'"
+        elif not all(op.get(key) for key in BATCH_OPS[kind]):
+            error = f"op {n}: '{kind}' requires {', '.join(BATCH_OPS[kind])}"
+        else:
+            error = check_args(None, op.get("marker"), op.get("label"))
+            if error:
+                error = f"op {n}: {error}"
+    if error:
+        print(f"Error: {error}")
+        sys.exit(1)
+
+    workbook = xmind.load(args.file)
+    root = get_root_topic(workbook)
+
+    if not root:
+        print("Error: Could not find root topic")
+        sys.exit(1)
+
+    # The index maps each title to its first topic in document order. Titles
+    # whose first topic may have changed (an add or rename onto an existing
+    # title, or a rename away from one) are dropped from it and marked
+    # stale, so their next lookup misses and rebuilds the index. While
+    # stale, a title missing from the index may still exist in the tree,
+    # so nothing new is inserted until the rebuild.
+    index = build_index(root)
+    stale = False
+    messages = []
+
+    def lookup(title):
+        nonlocal index, stale
+        entry = index.get(title)
+        if entry is None and stale:
+            index = build_index(root)
+            stale = False
+            entry = index.get(title)
+        return entry[0] if entry else None
+
+    def record(title, entry):
+        nonlocal stale
+        if stale or title in index:
+            index.pop(title, None)
+            stale = True
+        else:
+            index[title] = entry
+
+    for n, op in enumerate(ops, 1):
+        kind = op.get("op")
+
+        if kind == "add":
+            parent = lookup(op.get("parent"))
+            if not parent:
+                print(f"Error: op {n}: Parent topic '{op.get('parent')}' not found")
+                sys.exit(1)
+
+            new_topic = workbook.createTopic()
+            new_topic.setTitle(op["topic"])
+            set_topic_fields(new_topic, op.get("note"), op.get("comment"),
+                             op.get("marker"), op.get("label"))
+            parent.addSubTopic(new_topic)
+
+            record(op["topic"], (new_topic, parent))
+            messages.append(f"Added '{op['topic']}' under '{op['parent']}'")
+
+        else:
+            topic = lookup(op.get("target"))
+            if not topic:
+                print(f"Error: op {n}: Topic '{op.get('target')}' not found")
+                sys.exit(1)
+
+            if op.get("title"):
+                entry = index.pop(op["target"])
+                stale = True
+                topic.setTitle(op["title"])
+                record(op["title"], entry)
+            set_topic_fields(topic, op.get("note"), op.get("comment"),
+                             op.get("marker"), op.get("label"))
+            messages.append(f"Edited '{op['target']}'")
+
+    # Report changes only once they have actually been written
+    save_workbook(workbook, args.file)
+    for message in messages:
+        print(message)
+    print(f"Applied {len(ops)} operations to {args.file}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="XMind CLI - Create and edit XMind 8 files (official SDK)"
@@ -362,6 +815,11 @@ def main():
     p_edit.add_argument("--marker", help="Marker ID")
     p_edit.add_argument("--label", help="Label text")
 
+    # batch
+    p_batch = subparsers.add_parser("batch", help="Apply many add/edit operations at once")
+    p_batch.add_argument("file", help="XMind file path")
+    p_batch.add_argument("ops", help="Path to JSON (array) or NDJSON operations file")
+
     args = parser.parse_args()
 
     if not args.command:
@@ -374,10 +832,16 @@ def main():
         "markdown": cmd_markdown,
         "add": cmd_add,
         "edit": cmd_edit,
+        "batch": cmd_batch,
     }
 
     try:
         commands[args.command](args)
+    except BrokenPipeError:
+        # stdout was closed early (e.g. piped into head); silence the
+        # second error Python would raise when flushing it at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)